@@ -1,6 +1,9 @@
 import dataclasses
+import functools
 
 import jax.numpy as jnp
+import numpy as np
+import scipy.fft as sfft
 
 
 @dataclasses.dataclass
@@ -19,28 +22,38 @@ class Timeseries:
         return float(1 / (self.t[1] - self.t[0]))
 
     def to_periodogram(self) -> "Periodogram":
-        """Compute the one-sided periodogram of the timeseries."""
-        freq = jnp.fft.rfftfreq(len(self.y), d=1 / self.fs)
-        power = jnp.abs(jnp.fft.rfft(self.y)) ** 2 / len(self.y)
-        return Periodogram(freq[1:], power[1:])
-
-    def standardise(self):
-        """Standardise the timeseries to have zero mean and unit variance."""
-        self.std = float(jnp.std(self.y))
-        y = (self.y - jnp.mean(self.y)) / self.std
-        return Timeseries(self.t, y, self.std)
+        """Compute the one-sided periodogram of the timeseries.
+
+        The FFT is computed on the host with scipy; only the resulting
+        periodogram is moved to the device.
+        """
+        y = np.asarray(self.y)
+        freq = sfft.rfftfreq(len(y), d=1 / self.fs)
+        power = np.abs(sfft.rfft(y)) ** 2 / len(y)
+        return Periodogram(jnp.asarray(freq[1:]), jnp.asarray(power[1:]))
+
+    def standardise(self) -> "Timeseries":
+        """Return a copy standardised to have zero mean and unit variance."""
+        y = np.asarray(self.y)
+        std = float(np.std(y))
+        return Timeseries(self.t, (y - np.mean(y)) / std, std)
 
     def __repr__(self):
         return f"Timeseries(n={len(self.t)}, std={self.std:.3f}, fs={self.fs:.3f})"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class Periodogram:
     freqs: jnp.ndarray
     power: jnp.ndarray
     filtered: bool = False
 
     def __post_init__(self):
+        # store immutable jax copies so cached values (log_power, spline
+        # models keyed on this object) cannot go stale via in-place edits
+        object.__setattr__(self, "freqs", jnp.asarray(self.freqs))
+        object.__setattr__(self, "power", jnp.asarray(self.power))
+
         # assert no nans
         if jnp.isnan(self.freqs).any() or jnp.isnan(self.power).any():
 
@@ -50,34 +63,24 @@ class Periodogram:
     def n(self):
         return len(self.freqs)
 
+    @functools.cached_property
+    def log_power(self) -> jnp.ndarray:
+        """Log of the power (computed once and cached)."""
+        return jnp.log(self.power)
+
     @property
     def fs(self) -> float:
         """Sampling frequency computed from the frequency array."""
         return float(2 * self.freqs[-1])
 
     def highpass(self, min_freq: float) -> "Periodogram":
-        """Return a new Periodogram with frequencies above a threshold."""
-        mask = self.freqs > min_freq
-        return Periodogram(self.freqs[mask], self.power[mask], filtered=True)
+        """Return a new Periodogram with frequencies above a threshold.
 
-    def to_timeseries(self) -> "Timeseries":
-        """Compute the inverse FFT of the periodogram."""
-        y = jnp.fft.irfft(self.power, n=2 * (self.n - 1))
-        t = jnp.linspace(0, 1 / self.fs, len(y))
-        return Timeseries(t, y)
-
-    def __mul__(self, other):
-        return Periodogram(self.freqs, self.power * other)
-
-    def __truediv__(self, other):
-        return Periodogram(self.freqs, self.power / other)
+        As `freqs` is sorted, this is a contiguous slice from the first
+        frequency above `min_freq`.
+        """
+        cut = int(jnp.searchsorted(self.freqs, min_freq, side="right"))
+        return Periodogram(self.freqs[cut:], self.power[cut:], filtered=True)
 
     def __repr__(self):
         return f"Periodogram(n={self.n}, fs={self.fs:.3f}, filtered={self.filtered})"
-
-
-def compute_welsch_psd(
-    freqs: jnp.ndarray, power: jnp.ndarray, alpha: float = 2.0
-) -> jnp.ndarray:
-    """Compute the Welsch power spectral density of a periodogram."""
-    return power / (1 + (freqs / alpha) ** 2)
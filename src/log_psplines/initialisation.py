@@ -1,3 +1,4 @@
+import functools
 import warnings
 from typing import Tuple
 
@@ -6,50 +7,92 @@ import jax.numpy as jnp
 import numpy as np
 import optax
 from jax.experimental.sparse import BCOO
-from skfda.misc.operators import LinearDifferentialOperator
-from skfda.misc.regularization import L2Regularization
-from skfda.representation.basis import BSplineBasis
+from scipy.interpolate import BSpline
 
 from .datatypes import Periodogram
 
 __all__ = ["init_weights", "init_basis_and_penalty", "init_knots"]
 
 
+def _init_loss(
+    weights: jnp.ndarray,
+    basis: jnp.ndarray,
+    log_pdgrm: jnp.ndarray,
+    log_param: jnp.ndarray,
+) -> float:
+    """Mean squared error between the log periodogram and the log model."""
+    lnmodel = basis @ weights + log_param
+    return jnp.mean((log_pdgrm - lnmodel) ** 2)
+
+
+# basis matmul + loss + gradient compiled as one kernel (per shape)
+_init_loss_and_grad = jax.jit(jax.value_and_grad(_init_loss))
+
+
+@functools.lru_cache(maxsize=None)
+def _make_init_weights_fn(num_steps: int, tol: float):
+    """Build (and cache) the jitted Adam warm-start for these loop settings.
+
+    The returned function takes (init_weights, log_pdgrm, basis, log_param)
+    as arguments, so jax.jit compiles it once per input shape and repeated
+    calls with fresh arrays of the same shapes reuse that compilation.
+    """
+    optimizer = optax.adam(learning_rate=1e-2)
+
+    @jax.jit
+    def optimise(init_weights, log_pdgrm, basis, log_param):
+        loss_and_grad = functools.partial(
+            _init_loss_and_grad,
+            basis=basis,
+            log_pdgrm=log_pdgrm,
+            log_param=log_param,
+        )
+
+        def not_converged(state):
+            i, _, _, prev_loss, loss = state
+            return (i < num_steps) & (jnp.abs(prev_loss - loss) > tol)
+
+        def step(state):
+            i, weights, opt_state, _, prev_loss = state
+            loss, grads = loss_and_grad(weights)
+            updates, opt_state = optimizer.update(grads, opt_state)
+            weights = optax.apply_updates(weights, updates)
+            return (i + 1, weights, opt_state, prev_loss, loss)
+
+        opt_state = optimizer.init(init_weights)
+        init_state = (0, init_weights, opt_state, jnp.inf, 0.0)
+        _, final_weights, _, _, _ = jax.lax.while_loop(
+            not_converged, step, init_state
+        )
+        return final_weights
+
+    return optimise
+
+
 def init_weights(
     log_pdgrm: jnp.ndarray,
     log_psplines: "LogPSplines",
     init_weights: jnp.ndarray = None,
     num_steps: int = 5000,
+    tol: float = 1e-5,
 ) -> jnp.ndarray:
     """
     Optimize spline weights by directly minimizing the negative Whittle log likelihood.
 
-    This function wraps the optimization loop in a JAX-compiled loop using jax.lax.fori_loop.
+    The optimisation loop is a single jitted jax.lax.while_loop over the Adam
+    steps, stopping early once the change in loss between steps drops below
+    `tol` (or after `num_steps` steps). The compiled loop is reused across
+    calls with the same shapes, so repeated calls only compile once.
     """
-    log_param = log_psplines.log_parametric_model
-
     if init_weights is None:
         init_weights = jnp.zeros(log_psplines.n_basis)
-    optimizer = optax.adam(learning_rate=1e-2)
-    opt_state = optimizer.init(init_weights)
-
-    @jax.jit
-    def compute_loss(weights: jnp.ndarray) -> float:
-        lnmodel = log_psplines(weights) + log_param
-        mse = jnp.mean((log_pdgrm - lnmodel) ** 2)
-        return mse
-
-    def step(i, state):
-        weights, opt_state = state
-        loss, grads = jax.value_and_grad(compute_loss)(weights)
-        updates, opt_state = optimizer.update(grads, opt_state)
-        weights = optax.apply_updates(weights, updates)
-        return (weights, opt_state)
-
-    init_state = (init_weights, opt_state)
-    final_state = jax.lax.fori_loop(0, num_steps, step, init_state)
-    final_weights, _ = final_state
-    return final_weights
+    optimise = _make_init_weights_fn(num_steps, tol)
+    return optimise(
+        init_weights,
+        log_pdgrm,
+        log_psplines.basis,
+        log_psplines.log_parametric_model,
+    )
 
 
 def init_basis_and_penalty(
@@ -65,44 +108,46 @@ def init_basis_and_penalty(
         knots: Array of knots (values between 0 and 1).
         degree: Degree of the B-spline.
         n_grid_points: Number of grid points.
-        diffMatrixOrder: Order of the differential operator for regularization.
+        diffMatrixOrder: Order of the difference penalty on the weights.
         epsilon: Small constant for numerical stability.
 
     Returns:
         A tuple (basis_matrix, penalty_matrix) as JAX arrays.
     """
     order = degree + 1
-    basis = BSplineBasis(domain_range=[0, 1], order=order, knots=knots)
-    grid_points = np.linspace(0, 1, n_grid_points)
-    basis_matrix = (
-        basis.to_basis().to_grid(grid_points).data_matrix.squeeze().T
-    )
-    # normalise basis matrix elements (for numerical stability)
+    knots = np.asarray(knots, dtype=np.float64)
+    # pad the knots with repeated boundary knots (clamped B-spline)
     knots_with_boundary = np.concatenate(
-        [np.repeat(0, degree), knots, np.repeat(1, degree)]
+        [np.repeat(knots[0], degree), knots, np.repeat(knots[-1], degree)]
     )
-    n_knots_total = len(knots_with_boundary)
-    mid_to_end = knots_with_boundary[degree + 1 :]
-    start_to_mid = knots_with_boundary[: (n_knots_total - degree - 1)]
-    norm_factor = (mid_to_end - start_to_mid) / (degree + 1)
-    norm_factor[norm_factor == 0] = np.inf  # Prevent division by zero.
-    basis_matrix = basis_matrix / norm_factor
+    # span the knots exactly (float32 knots may end just short of 1)
+    grid_points = np.linspace(knots[0], knots[-1], n_grid_points)
+    basis_matrix = BSpline.design_matrix(
+        grid_points, knots_with_boundary, degree
+    ).toarray()
+
+    # normalise basis matrix elements (for numerical stability)
+    mid_to_end = knots_with_boundary[order:]
+    start_to_mid = knots_with_boundary[:-order]
+    norm_factor = (mid_to_end - start_to_mid) / order
+    assert norm_factor.shape[0] == basis_matrix.shape[1]
+    # scale each column; zero-width supports are mapped to 0 (no div by zero)
+    inv_norm = 1.0 / np.where(norm_factor == 0, np.inf, norm_factor)
+    basis_matrix = basis_matrix * inv_norm[None, :]
 
     # swap all values below epsilon to 0
     # TODO: this is a hack... might not work
     # basis_matrix[basis_matrix < epsilon] = 0.0
     # basis_matrix = dense_to_sparse_jax(basis_matrix, threshold=epsilon)
 
-    basis_matrix = jnp.array(basis_matrix)
-
-    # Compute the penalty matrix using L2 regularization.
-    regularization = L2Regularization(
-        LinearDifferentialOperator(diffMatrixOrder)
-    )
-    p = regularization.penalty_matrix(basis)
-    p = p / np.max(p)
-    p = p + epsilon * np.eye(p.shape[1])
-    return basis_matrix, jnp.array(p)
+    # Compute the P-spline difference penalty: P = D^T D
+    n_basis = basis_matrix.shape[1]
+    D = np.diff(np.eye(n_basis), n=diffMatrixOrder, axis=0)
+    p = D.T @ D
+    # normalise and add epsilon to the diagonal in place (no temporaries)
+    p *= 1.0 / np.max(p)
+    np.fill_diagonal(p, p.diagonal() + epsilon)
+    return jnp.asarray(basis_matrix), jnp.asarray(p)
 
 
 def dense_to_sparse_jax(matrix: jnp.ndarray, threshold=1e-10) -> BCOO:
@@ -180,7 +225,7 @@ def init_knots(
     # Power-based density sampling
     density_knots = np.array([])
     if n_density > 0:
-        power = np.array(periodogram.power.copy(), dtype=np.float64)
+        power = np.array(periodogram.power, dtype=np.float64)
         if parametric_model is not None:
             power -= parametric_model
             # ensure power is positive
@@ -191,7 +236,12 @@ def init_knots(
 
         # Compute quantiles for density-based knots
         quantiles = np.linspace(0, 1, n_density + 2)[1:-1]
-        density_knots = np.interp(quantiles, cdf, periodogram.freqs)
+        # invert the (monotone) CDF: binary search + linear interpolation
+        freqs = np.asarray(periodogram.freqs, dtype=np.float64)
+        idx = np.clip(np.searchsorted(cdf, quantiles), 1, len(cdf) - 1)
+        t = (quantiles - cdf[idx - 1]) / (cdf[idx] - cdf[idx - 1] + 1e-30)
+        t = np.clip(t, 0.0, 1.0)
+        density_knots = freqs[idx - 1] + t * (freqs[idx] - freqs[idx - 1])
 
     # Combine and sort
     knots = np.concatenate(
@@ -22,19 +22,33 @@ def run_mcmc(
     num_samples=1000,
     rng_key=0,
     verbose=True,
+    num_chains=1,
+    chain_method="sequential",
+    spline_model: LogPSplines = None,
     **spline_kwgs,
 ) -> Tuple[MCMC, LogPSplines]:
     # Initialize the model + starting values
     rng_key = jax.random.PRNGKey(rng_key)
-    log_pdgrm = jnp.log(pdgrm.power)
-    spline_model = LogPSplines.from_periodogram(
-        pdgrm,
-        n_knots=spline_kwgs.get("n_knots", 10),
-        degree=spline_kwgs.get("degree", 3),
-        diffMatrixOrder=spline_kwgs.get("diffMatrixOrder", 2),
-        parametric_model=parametric_model,
-    )
-    print("Spline model:", spline_model)
+    log_pdgrm = pdgrm.log_power
+    if spline_model is None:
+        spline_model = LogPSplines.from_periodogram(
+            pdgrm,
+            n_knots=spline_kwgs.get("n_knots", 10),
+            degree=spline_kwgs.get("degree", 3),
+            diffMatrixOrder=spline_kwgs.get("diffMatrixOrder", 2),
+            parametric_model=parametric_model,
+        )
+    elif parametric_model is not None or spline_kwgs:
+        raise ValueError(
+            "parametric_model and spline kwargs cannot be combined with a "
+            "prebuilt spline_model (build the model with them instead)."
+        )
+    elif spline_model.n != pdgrm.n:
+        raise ValueError(
+            f"spline_model.n ({spline_model.n}) != pdgrm.n ({pdgrm.n})"
+        )
+    if verbose:
+        print("Spline model:", spline_model)
     delta_0 = alpha_delta / beta_delta
     phi_0 = alpha_phi / (beta_phi * delta_0)
     init_strategy = init_to_value(
@@ -47,10 +61,12 @@ def run_mcmc(
         kernel,
         num_warmup=num_warmup,
         num_samples=num_samples,
+        num_chains=num_chains,
         progress_bar=verbose,
         jit_model_args=True,
+        chain_method=chain_method,
     )
-    t0 = time.time()
+    t0 = time.perf_counter()
     mcmc.run(
         rng_key,
         log_pdgrm,
@@ -63,6 +79,6 @@ def run_mcmc(
         beta_delta,
     )
     # add attribute to the MCMC object for the spline model
-    setattr(mcmc, "runtime", time.time() - t0)
+    setattr(mcmc, "runtime", time.perf_counter() - t0)
 
     return mcmc, spline_model
@@ -1,4 +1,3 @@
-import jax.numpy as jnp
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -61,12 +60,13 @@ def plot_pdgrm(
             )
 
         if show_knots:
-            # get freq of knots (knots are at % of the freqs)
-            idx = (spline_model.knots * len(plt_data.freqs)).astype(int)
+            # get freq of knots (knots are at % of the freqs), on the host
+            n_freqs = len(plt_data.freqs)
+            idx = (np.asarray(spline_model.knots) * n_freqs).astype(int)
             # make sure no idx is out of bounds
-            idx = jnp.clip(idx, 0, len(plt_data.freqs) - 1)
+            idx = np.clip(idx, 0, n_freqs - 1)
             ax.loglog(
-                plt_data.freqs[idx],
+                np.asarray(plt_data.freqs)[idx],
                 plt_data.model[idx],
                 "o",
                 label="Knots",
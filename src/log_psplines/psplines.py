@@ -1,24 +1,38 @@
+import dataclasses
+import functools
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Union
 
-import numpy as np
+import jax
 from jax import numpy as jnp
 
 from .bayesian_model import build_spline
 from .datatypes import Periodogram
 from .initialisation import init_basis_and_penalty, init_knots, init_weights
 
+# (id(periodogram), n_knots, degree, diffMatrixOrder) -> (periodogram, model)
+# The periodogram is kept alive in the value, so its id cannot be reused
+# while the entry is cached.
+_FROM_PERIODOGRAM_CACHE: OrderedDict = OrderedDict()
+_FROM_PERIODOGRAM_CACHE_SIZE = 16
 
-@dataclass
+
+@jax.tree_util.register_pytree_node_class
+@dataclass(frozen=True)
 class LogPSplines:
-    """Model for log power splines using a B-spline basis and a penalty matrix."""
+    """Model for log power splines using a B-spline basis and a penalty matrix.
+
+    Registered as a JAX pytree: the arrays are leaves, while `degree`,
+    `diffMatrixOrder` and `n` are static (so retraces are keyed on shapes).
+    """
 
     degree: int
     diffMatrixOrder: int
     n: int
     basis: jnp.ndarray
     penalty_matrix: jnp.ndarray
-    knots: np.ndarray
+    knots: jnp.ndarray
     weights: jnp.ndarray
     parametric_model: Union[jnp.ndarray, None] = None
 
@@ -45,6 +59,14 @@ class LogPSplines:
         parametric_model: jnp.ndarray = None,
         knot_kwargs: dict = {},
     ):
+        # models only depend on the periodogram + these ints when there is
+        # no parametric model / custom knot placement; reuse them if so
+        cache_key = (id(periodogram), n_knots, degree, diffMatrixOrder)
+        use_cache = parametric_model is None and not knot_kwargs
+        if use_cache and cache_key in _FROM_PERIODOGRAM_CACHE:
+            _FROM_PERIODOGRAM_CACHE.move_to_end(cache_key)
+            return _FROM_PERIODOGRAM_CACHE[cache_key][1]
+
         knots = init_knots(
             n_knots, periodogram, parametric_model, **knot_kwargs
         )
@@ -53,7 +75,7 @@ class LogPSplines:
             knots, degree, periodogram.n, diffMatrixOrder
         )
         model = cls(
-            knots=knots,
+            knots=jnp.asarray(knots),
             degree=degree,
             diffMatrixOrder=diffMatrixOrder,
             n=periodogram.n,
@@ -62,17 +84,40 @@ class LogPSplines:
             weights=jnp.zeros(basis.shape[1]),
             parametric_model=parametric_model,
         )
-        weights = init_weights(jnp.log(periodogram.power), model)
-        model.weights = weights
+        weights = init_weights(periodogram.log_power, model)
+        model = dataclasses.replace(model, weights=weights)
+
+        if use_cache:
+            _FROM_PERIODOGRAM_CACHE[cache_key] = (periodogram, model)
+            if len(_FROM_PERIODOGRAM_CACHE) > _FROM_PERIODOGRAM_CACHE_SIZE:
+                _FROM_PERIODOGRAM_CACHE.popitem(last=False)
         return model
 
-    @property
+    def tree_flatten(self):
+        children = (
+            self.basis,
+            self.penalty_matrix,
+            self.knots,
+            self.weights,
+            self.parametric_model,
+        )
+        aux_data = (self.degree, self.diffMatrixOrder, self.n)
+        return children, aux_data
+
+    @classmethod
+    def tree_unflatten(cls, aux_data, children):
+        # bypass __init__/__post_init__: leaves may be tracers or placeholders
+        obj = object.__new__(cls)
+        names = [f.name for f in dataclasses.fields(cls)]
+        for name, value in zip(names, aux_data + tuple(children)):
+            object.__setattr__(obj, name, value)
+        return obj
+
+    @functools.cached_property
     def log_parametric_model(self) -> jnp.ndarray:
-        if not hasattr(self, "_log_parametric_model"):
-            if self.parametric_model is None:
-                self.parametric_model = jnp.ones(self.n)
-            self._log_parametric_model = jnp.log(self.parametric_model)
-        return self._log_parametric_model
+        if self.parametric_model is None:
+            return jnp.zeros(self.n)
+        return jnp.log(self.parametric_model)
 
     @property
     def order(self) -> int:
@@ -23,6 +23,7 @@ def mock_pdgrm() -> Periodogram:
     fs = 100  # Sampling frequency in Hz.
     dt = 1.0 / fs
     t = np.linspace(0, (n_samples - 1) * dt, n_samples)
-    noise = scipy.signal.lfilter([1], a_coeff, np.random.randn(n_samples))
+    rng = np.random.default_rng(0)
+    noise = scipy.signal.lfilter([1], a_coeff, rng.standard_normal(n_samples))
     noise = (noise - np.mean(noise)) / np.std(noise)
     return Timeseries(t, noise).to_periodogram().highpass(5)
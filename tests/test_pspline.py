@@ -4,10 +4,16 @@ import time
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
 import numpy as np
+import pytest
 
 from log_psplines.bayesian_model import whittle_lnlike
 from log_psplines.datatypes import Periodogram, Timeseries
-from log_psplines.example_datasets.ar_data import ARData
+from log_psplines import initialisation
+from log_psplines.initialisation import (
+    init_basis_and_penalty,
+    init_knots,
+    init_weights,
+)
 from log_psplines.mcmc import run_mcmc
 from log_psplines.plotting import plot_basis, plot_pdgrm, plot_trace
 from log_psplines.psplines import LogPSplines
@@ -39,14 +45,64 @@ def test_spline_init(mock_pdgrm: Periodogram, outdir):
     fig.savefig(os.path.join(outdir, "test_spline_init.png"))
 
 
-def test_mcmc(mock_pdgrm: Periodogram, outdir):
+def test_periodogram_matches_jnp_fft():
+    rng = np.random.default_rng(1)
+    t = np.linspace(0, 10.23, 1024)
+    y = rng.standard_normal(1024)
+    pdgrm = Timeseries(t, y).to_periodogram()
+    freqs = jnp.fft.rfftfreq(len(y), d=t[1] - t[0])[1:]
+    power = (jnp.abs(jnp.fft.rfft(jnp.asarray(y))) ** 2 / len(y))[1:]
+    assert jnp.allclose(pdgrm.freqs, freqs)
+    assert jnp.allclose(pdgrm.power, power, rtol=1e-4, atol=1e-5)
+
+
+def test_highpass_matches_mask(mock_pdgrm: Periodogram):
+    # min_freq exactly on a grid frequency must be excluded (freqs > min_freq)
+    for min_freq in [float(mock_pdgrm.freqs[10]), 7.3]:
+        mask = mock_pdgrm.freqs > min_freq
+        filtered = mock_pdgrm.highpass(min_freq)
+        assert jnp.array_equal(filtered.freqs, mock_pdgrm.freqs[mask])
+        assert jnp.array_equal(filtered.power, mock_pdgrm.power[mask])
+        assert filtered.filtered
+
+
+def test_spline_model_cached(mock_pdgrm: Periodogram):
+    kwgs = dict(n_knots=10, degree=3, diffMatrixOrder=2)
+    model = LogPSplines.from_periodogram(mock_pdgrm, **kwgs)
+    assert LogPSplines.from_periodogram(mock_pdgrm, **kwgs) is model
+    kwgs["n_knots"] = 12
+    assert LogPSplines.from_periodogram(mock_pdgrm, **kwgs) is not model
+
+
+def test_periodogram_copies_input():
+    freqs, power = np.linspace(1, 50, 100), np.ones(100)
+    pdgrm = Periodogram(freqs, power)
+    power *= 10  # in-place edits must not leak into the cached log power
+    assert jnp.allclose(pdgrm.log_power, 0.0)
+
 
-    ar_data = ARData(order=2, duration=8.0, fs=1024.0, sigma=1.0, seed=42)
-    pdgm = (
-        Timeseries(ar_data.ts, ar_data.psd_theoretical)
-        .to_periodogram()
-        .highpass(5)
+def test_basis_and_penalty():
+    knots = np.linspace(0, 1, 10)
+    basis, penalty = init_basis_and_penalty(
+        knots, degree=3, n_grid_points=100, diffMatrixOrder=2
     )
+    n_basis = len(knots) + 3 - 1
+    assert basis.shape == (100, n_basis)
+    assert penalty.shape == (n_basis, n_basis)
+    assert jnp.allclose(penalty, penalty.T)
+    # a 2nd-order difference penalty does not penalise linear weights
+    linear_weights = jnp.arange(n_basis, dtype=jnp.float32)
+    assert linear_weights @ penalty @ linear_weights < 1e-2
+
+
+def test_init_knots(mock_pdgrm: Periodogram):
+    knots = init_knots(20, mock_pdgrm, frac_uniform=0.0, frac_log=0.0)
+    assert len(knots) == 20
+    assert knots[0] == 0 and knots[-1] == 1
+    assert np.all(np.diff(knots) > 0)
+
+
+def test_mcmc(mock_pdgrm: Periodogram, outdir):
 
     mcmc, spline_model = run_mcmc(
         mock_pdgrm, n_knots=30, num_samples=250, num_warmup=1000
@@ -59,3 +115,66 @@ def test_mcmc(mock_pdgrm: Periodogram, outdir):
 
     assert mcmc.runtime < 30
     plot_trace(mcmc, os.path.join(outdir, "traceplot.png"))
+
+
+def test_mcmc_with_spline_model(mock_pdgrm: Periodogram):
+    spline_model = LogPSplines.from_periodogram(
+        mock_pdgrm, n_knots=10, degree=3, diffMatrixOrder=2
+    )
+    kwgs = dict(num_samples=10, num_warmup=10, verbose=False)
+    mcmc, model = run_mcmc(mock_pdgrm, spline_model=spline_model, **kwgs)
+    assert model is spline_model
+    assert mcmc.get_samples()["weights"].shape == (10, model.n_basis)
+
+    with pytest.raises(ValueError):
+        run_mcmc(mock_pdgrm, spline_model=spline_model, n_knots=20, **kwgs)
+    with pytest.raises(ValueError):
+        run_mcmc(
+            mock_pdgrm,
+            spline_model=spline_model,
+            parametric_model=mock_pdgrm.power,
+            **kwgs,
+        )
+    with pytest.raises(ValueError):
+        run_mcmc(mock_pdgrm.highpass(10), spline_model=spline_model, **kwgs)
+
+
+def test_init_weights_compiles_once(mock_pdgrm: Periodogram, monkeypatch):
+    n_traces = 0
+    loss_and_grad = initialisation._init_loss_and_grad
+
+    def counting_loss_and_grad(*args, **kwargs):
+        nonlocal n_traces
+        n_traces += 1  # only runs while jax traces the loop body
+        return loss_and_grad(*args, **kwargs)
+
+    monkeypatch.setattr(
+        initialisation, "_init_loss_and_grad", counting_loss_and_grad
+    )
+    initialisation._make_init_weights_fn.cache_clear()
+    model = LogPSplines.from_periodogram(
+        mock_pdgrm, n_knots=10, degree=3, diffMatrixOrder=2
+    )
+    for scale in [1.0, 2.0]:  # fresh arrays with the same shapes
+        init_weights(jnp.log(mock_pdgrm.power * scale), model)
+    assert n_traces == 1
+    initialisation._make_init_weights_fn.cache_clear()
+
+
+def test_init_weights_early_stop(mock_pdgrm: Periodogram):
+    model = LogPSplines.from_periodogram(
+        mock_pdgrm, n_knots=10, degree=3, diffMatrixOrder=2
+    )
+    log_pdgrm = mock_pdgrm.log_power
+
+    def mse(weights):
+        return float(jnp.mean((log_pdgrm - model(weights)) ** 2))
+
+    early = init_weights(log_pdgrm, model, num_steps=5000, tol=1e-5)
+    # a larger cap changes nothing => the loop stopped before 5000 steps
+    longer_cap = init_weights(log_pdgrm, model, num_steps=10000, tol=1e-5)
+    assert jnp.array_equal(early, longer_cap)
+
+    full = init_weights(log_pdgrm, model, num_steps=5000, tol=0.0)
+    assert not jnp.array_equal(early, full)
+    assert abs(mse(early) - mse(full)) < 1e-2